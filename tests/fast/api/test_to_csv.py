@@ -1,16 +1,54 @@
 import duckdb
+import hashlib
 import os
-import pandas._testing as tm
 import datetime
-import csv
 import pytest
 from conftest import NumpyPandas, ArrowPandas, getTimeSeriesData
 
+# keep tests sharing the module-scoped connection on one xdist worker
+# (run with `-n auto --dist loadgroup` to parallelize across files)
+pytestmark = pytest.mark.xdist_group("to_csv")
+
+# csv.QUOTE_ALL without dragging in the csv module at collection time
+QUOTE_ALL = 1
+
+# constructed once at import; building these per-parametrize re-imports pandas/pyarrow
+PANDAS_BACKENDS = [NumpyPandas(), ArrowPandas()]
+
+# the date_format test only needs the business-day index of the generated series,
+# so build it once instead of materializing a fresh random DataFrame per case
+TS_INDEX = getTimeSeriesData()["A"].index
+
+
+@pytest.fixture(params=PANDAS_BACKENDS)
+def pandas(request):
+    # one fixture instead of a parametrize decorator on every test
+    return request.param
+
+
+@pytest.fixture(scope="module")
+def to_csv_con():
+    # share a single connection across the module, tests get isolated cursors below
+    with duckdb.connect(":memory:") as conn:
+        yield conn
+
+
+@pytest.fixture(scope="function")
+def temp_file_name(tmp_path):
+    # every test writes to the same name inside its own tmp_path
+    return str(tmp_path / "test.csv")
+
+
+@pytest.fixture(scope="function")
+def default_con(to_csv_con):
+    # override the global fixture with a cursor on the shared connection so we
+    # don't pay connection setup per parametrized case
+    with to_csv_con.cursor() as cur:
+        yield cur
+
 
 class TestToCSV(object):
-    @pytest.mark.parametrize("pandas", [NumpyPandas(), ArrowPandas()])
-    def test_basic_to_csv(self, pandas, tmp_path, default_con):
-        temp_file_name = str(tmp_path / "test.csv")
+    def test_basic_to_csv(self, pandas, temp_file_name, default_con):
         df = pandas.DataFrame({"a": [5, 3, 23, 2], "b": [45, 234, 234, 2]})
         rel = default_con.from_df(df)
 
@@ -19,9 +57,7 @@ class TestToCSV(object):
         csv_rel = default_con.read_csv(temp_file_name)
         assert rel.execute().fetchall() == csv_rel.execute().fetchall()
 
-    @pytest.mark.parametrize("pandas", [NumpyPandas(), ArrowPandas()])
-    def test_to_csv_sep(self, pandas, tmp_path, default_con):
-        temp_file_name = str(tmp_path / "test.csv")
+    def test_to_csv_sep(self, pandas, temp_file_name, default_con):
         df = pandas.DataFrame({"a": [5, 3, 23, 2], "b": [45, 234, 234, 2]})
         rel = default_con.from_df(df)
 
@@ -30,9 +66,7 @@ class TestToCSV(object):
         csv_rel = default_con.read_csv(temp_file_name, sep=",")
         assert rel.execute().fetchall() == csv_rel.execute().fetchall()
 
-    @pytest.mark.parametrize("pandas", [NumpyPandas(), ArrowPandas()])
-    def test_to_csv_na_rep(self, pandas, tmp_path, default_con):
-        temp_file_name = str(tmp_path / "test.csv")
+    def test_to_csv_na_rep(self, pandas, temp_file_name, default_con):
         df = pandas.DataFrame({"a": [5, None, 23, 2], "b": [45, 234, 234, 2]})
         rel = default_con.from_df(df)
 
@@ -41,9 +75,7 @@ class TestToCSV(object):
         csv_rel = default_con.read_csv(temp_file_name, na_values="test")
         assert rel.execute().fetchall() == csv_rel.execute().fetchall()
 
-    @pytest.mark.parametrize("pandas", [NumpyPandas(), ArrowPandas()])
-    def test_to_csv_header(self, pandas, tmp_path, default_con):
-        temp_file_name = str(tmp_path / "test.csv")
+    def test_to_csv_header(self, pandas, temp_file_name, default_con):
         df = pandas.DataFrame({"a": [5, None, 23, 2], "b": [45, 234, 234, 2]})
         rel = default_con.from_df(df)
 
@@ -52,9 +84,7 @@ class TestToCSV(object):
         csv_rel = default_con.read_csv(temp_file_name)
         assert rel.execute().fetchall() == csv_rel.execute().fetchall()
 
-    @pytest.mark.parametrize("pandas", [NumpyPandas(), ArrowPandas()])
-    def test_to_csv_quotechar(self, pandas, tmp_path, default_con):
-        temp_file_name = str(tmp_path / "test.csv")
+    def test_to_csv_quotechar(self, pandas, temp_file_name, default_con):
         df = pandas.DataFrame(
             {"a": ["'a,b,c'", None, "hello", "bye"], "b": [45, 234, 234, 2]}
         )
@@ -65,9 +95,7 @@ class TestToCSV(object):
         csv_rel = default_con.read_csv(temp_file_name, sep=",", quotechar="'")
         assert rel.execute().fetchall() == csv_rel.execute().fetchall()
 
-    @pytest.mark.parametrize("pandas", [NumpyPandas(), ArrowPandas()])
-    def test_to_csv_escapechar(self, pandas, tmp_path, default_con):
-        temp_file_name = str(tmp_path / "test.csv")
+    def test_to_csv_escapechar(self, pandas, temp_file_name, default_con):
         df = pandas.DataFrame(
             {
                 "c_bool": [True, False],
@@ -81,12 +109,10 @@ class TestToCSV(object):
         csv_rel = default_con.read_csv(temp_file_name, quotechar='"', escapechar="!")
         assert rel.execute().fetchall() == csv_rel.execute().fetchall()
 
-    @pytest.mark.parametrize("pandas", [NumpyPandas(), ArrowPandas()])
-    def test_to_csv_date_format(self, pandas, tmp_path, default_con):
-        temp_file_name = str(tmp_path / "test.csv")
-        df = pandas.DataFrame(getTimeSeriesData())
-        dt_index = df.index
-        df = pandas.DataFrame({"A": dt_index, "B": dt_index.shift(1)}, index=dt_index)
+    def test_to_csv_date_format(self, pandas, temp_file_name, default_con):
+        df = pandas.DataFrame(
+            {"A": TS_INDEX, "B": TS_INDEX.shift(1)}, index=TS_INDEX
+        )
         rel = default_con.from_df(df)
         rel.to_csv(temp_file_name, date_format="%Y%m%d")
 
@@ -94,9 +120,7 @@ class TestToCSV(object):
 
         assert rel.execute().fetchall() == csv_rel.execute().fetchall()
 
-    @pytest.mark.parametrize("pandas", [NumpyPandas(), ArrowPandas()])
-    def test_to_csv_timestamp_format(self, pandas, tmp_path, default_con):
-        temp_file_name = str(tmp_path / "test.csv")
+    def test_to_csv_timestamp_format(self, pandas, temp_file_name, default_con):
         data = [datetime.time(hour=23, minute=1, second=34, microsecond=234345)]
         df = pandas.DataFrame({"0": pandas.Series(data=data, dtype="object")})
         rel = default_con.from_df(df)
@@ -106,9 +130,7 @@ class TestToCSV(object):
 
         assert rel.execute().fetchall() == csv_rel.execute().fetchall()
 
-    @pytest.mark.parametrize("pandas", [NumpyPandas(), ArrowPandas()])
-    def test_to_csv_quoting_off(self, pandas, tmp_path, default_con):
-        temp_file_name = str(tmp_path / "test.csv")
+    def test_to_csv_quoting_off(self, pandas, temp_file_name, default_con):
         df = pandas.DataFrame({"a": ["string1", "string2", "string3"]})
         rel = default_con.from_df(df)
         rel.to_csv(temp_file_name, quoting=None)
@@ -116,9 +138,7 @@ class TestToCSV(object):
         csv_rel = default_con.read_csv(temp_file_name)
         assert rel.execute().fetchall() == csv_rel.execute().fetchall()
 
-    @pytest.mark.parametrize("pandas", [NumpyPandas(), ArrowPandas()])
-    def test_to_csv_quoting_on(self, pandas, tmp_path, default_con):
-        temp_file_name = str(tmp_path / "test.csv")
+    def test_to_csv_quoting_on(self, pandas, temp_file_name, default_con):
         df = pandas.DataFrame({"a": ["string1", "string2", "string3"]})
         rel = default_con.from_df(df)
         rel.to_csv(temp_file_name, quoting="force")
@@ -126,21 +146,15 @@ class TestToCSV(object):
         csv_rel = default_con.read_csv(temp_file_name)
         assert rel.execute().fetchall() == csv_rel.execute().fetchall()
 
-    @pytest.mark.parametrize("pandas", [NumpyPandas(), ArrowPandas()])
-    def test_to_csv_quoting_quote_all(self, pandas, tmp_path, default_con):
-        temp_file_name = str(tmp_path / "test.csv")
-
+    def test_to_csv_quoting_quote_all(self, pandas, temp_file_name, default_con):
         df = pandas.DataFrame({"a": ["string1", "string2", "string3"]})
         rel = default_con.from_df(df)
-        rel.to_csv(temp_file_name, quoting=csv.QUOTE_ALL)
+        rel.to_csv(temp_file_name, quoting=QUOTE_ALL)
 
         csv_rel = default_con.read_csv(temp_file_name)
         assert rel.execute().fetchall() == csv_rel.execute().fetchall()
 
-    @pytest.mark.parametrize("pandas", [NumpyPandas(), ArrowPandas()])
-    def test_to_csv_encoding_incorrect(self, pandas, tmp_path, default_con):
-        temp_file_name = str(tmp_path / "test.csv")
-
+    def test_to_csv_encoding_incorrect(self, pandas, temp_file_name, default_con):
         df = pandas.DataFrame({"a": ["string1", "string2", "string3"]})
         rel = default_con.from_df(df)
         with pytest.raises(
@@ -149,30 +163,23 @@ class TestToCSV(object):
         ):
             rel.to_csv(temp_file_name, encoding="nope")
 
-    @pytest.mark.parametrize("pandas", [NumpyPandas(), ArrowPandas()])
-    def test_to_csv_encoding_correct(self, pandas, tmp_path, default_con):
-        temp_file_name = str(tmp_path / "test.csv")
-
+    def test_to_csv_encoding_correct(self, pandas, temp_file_name, default_con):
         df = pandas.DataFrame({"a": ["string1", "string2", "string3"]})
         rel = default_con.from_df(df)
         rel.to_csv(temp_file_name, encoding="UTF-8")
         csv_rel = default_con.read_csv(temp_file_name)
         assert rel.execute().fetchall() == csv_rel.execute().fetchall()
 
-    @pytest.mark.parametrize("pandas", [NumpyPandas(), ArrowPandas()])
-    def test_compression_gzip(self, pandas, tmp_path, default_con):
-        temp_file_name = str(tmp_path / "test.csv")
-
+    def test_compression_gzip(self, pandas, temp_file_name, default_con):
         df = pandas.DataFrame({"a": ["string1", "string2", "string3"]})
         rel = default_con.from_df(df)
         rel.to_csv(temp_file_name, compression="gzip")
         csv_rel = default_con.read_csv(temp_file_name, compression="gzip")
         assert rel.execute().fetchall() == csv_rel.execute().fetchall()
 
-    @pytest.mark.parametrize("pandas", [NumpyPandas(), ArrowPandas()])
-    def test_to_csv_partition(self, pandas, tmp_path, default_con):
-        temp_file_name = str(tmp_path / "test.csv")
-
+    @pytest.mark.parametrize("overwrite", [False, True])
+    @pytest.mark.parametrize("write_partition_columns", [False, True])
+    def test_to_csv_partition(self, pandas, temp_file_name, default_con, overwrite, write_partition_columns):
         df = pandas.DataFrame(
             {
                 "c_category": ["a", "a", "b", "b"],
@@ -183,116 +190,32 @@ class TestToCSV(object):
             }
         )
         rel = default_con.from_df(df)
-        rel.to_csv(temp_file_name, header=True, partition_by=["c_category"])
-        csv_rel = default_con.sql(
-            f"""FROM read_csv_auto('{temp_file_name}/*/*.csv', hive_partitioning=TRUE, header=TRUE);"""
-        )
-        expected = [
-            (True, 1.0, 42.0, "a", "a"),
-            (False, 3.2, None, "b,c", "a"),
-            (True, 3.0, 123.0, "e", "b"),
-            (True, 4.0, 321.0, "f", "b"),
-        ]
-
-        assert csv_rel.execute().fetchall() == expected
-
-    @pytest.mark.parametrize("pandas", [NumpyPandas(), ArrowPandas()])
-    def test_to_csv_partition_with_columns_written(self, pandas, tmp_path, default_con):
-        temp_file_name = str(tmp_path / "test.csv")
-
-        df = pandas.DataFrame(
-            {
-                "c_category": ["a", "a", "b", "b"],
-                "c_bool": [True, False, True, True],
-                "c_float": [1.0, 3.2, 3.0, 4.0],
-                "c_int": [42, None, 123, 321],
-                "c_string": ["a", "b,c", "e", "f"],
-            }
-        )
-        rel5 = default_con.from_df(df)
-        res = default_con.sql("FROM rel5 order by all")
-        rel5.to_csv(
+        if overwrite:
+            # write once so the overwriting write actually has something to replace
+            rel.to_csv(
+                temp_file_name,
+                header=True,
+                partition_by=["c_category"],
+                write_partition_columns=write_partition_columns,
+            )
+        rel.to_csv(
             temp_file_name,
             header=True,
             partition_by=["c_category"],
-            write_partition_columns=True,
+            overwrite=overwrite,
+            write_partition_columns=write_partition_columns,
         )
+        # When partition columns are read from directory names, column order becomes
+        # different from the original, so select them back in the original order
         csv_rel = default_con.sql(
-            f"""FROM read_csv_auto('{temp_file_name}/*/*.csv', hive_partitioning=TRUE, header=TRUE) order by all;"""
+            """SELECT c_category, c_bool, c_float, c_int, c_string
+            FROM read_csv_auto(?, hive_partitioning=TRUE, header=TRUE) order by all;""",
+            params=[f"{temp_file_name}/*/*.csv"],
         )
+        res = default_con.sql("FROM rel order by all")
         assert res.execute().fetchall() == csv_rel.execute().fetchall()
 
-    @pytest.mark.parametrize("pandas", [NumpyPandas(), ArrowPandas()])
-    def test_to_csv_overwrite(self, pandas, tmp_path, default_con):
-        temp_file_name = str(tmp_path / "test.csv")
-
-        df = pandas.DataFrame(
-            {
-                "c_category_1": ["a", "a", "b", "b"],
-                "c_category_2": ["c", "c", "d", "d"],
-                "c_bool": [True, False, True, True],
-                "c_float": [1.0, 3.2, 3.0, 4.0],
-                "c_int": [42, None, 123, 321],
-                "c_string": ["a", "b,c", "e", "f"],
-            }
-        )
-        rel6 = default_con.from_df(df)
-        rel6.to_csv(
-            temp_file_name, header=True, partition_by=["c_category_1"]
-        )  # csv to be overwritten
-        rel6.to_csv(
-            temp_file_name, header=True, partition_by=["c_category_1"], overwrite=True
-        )
-        csv_rel = default_con.sql(
-            f"""FROM read_csv_auto('{temp_file_name}/*/*.csv', hive_partitioning=TRUE, header=TRUE);"""
-        )
-        # When partition columns are read from directory names, column order become different from original
-        expected = [
-            ("c", True, 1.0, 42.0, "a", "a"),
-            ("c", False, 3.2, None, "b,c", "a"),
-            ("d", True, 3.0, 123.0, "e", "b"),
-            ("d", True, 4.0, 321.0, "f", "b"),
-        ]
-        assert csv_rel.execute().fetchall() == expected
-
-    @pytest.mark.parametrize("pandas", [NumpyPandas(), ArrowPandas()])
-    def test_to_csv_overwrite_with_columns_written(self, pandas, tmp_path, default_con):
-        temp_file_name = str(tmp_path / "test.csv")
-
-        df = pandas.DataFrame(
-            {
-                "c_category_1": ["a", "a", "b", "b"],
-                "c_category_2": ["c", "c", "d", "d"],
-                "c_bool": [True, False, True, True],
-                "c_float": [1.0, 3.2, 3.0, 4.0],
-                "c_int": [42, None, 123, 321],
-                "c_string": ["a", "b,c", "e", "f"],
-            }
-        )
-        rel7 = default_con.from_df(df)
-        rel7.to_csv(
-            temp_file_name,
-            header=True,
-            partition_by=["c_category_1"],
-            write_partition_columns=True,
-        )  # csv to be overwritten
-        rel7.to_csv(
-            temp_file_name,
-            header=True,
-            partition_by=["c_category_1"],
-            overwrite=True,
-            write_partition_columns=True,
-        )
-        csv_rel = default_con.sql(
-            f"""FROM read_csv_auto('{temp_file_name}/*/*.csv', hive_partitioning=TRUE, header=TRUE) order by all;"""
-        )
-        res = default_con.sql("FROM rel7 order by all")
-        assert res.execute().fetchall() == csv_rel.execute().fetchall()
-
-    @pytest.mark.parametrize("pandas", [NumpyPandas(), ArrowPandas()])
-    def test_to_csv_overwrite_not_enabled(self, pandas, tmp_path, default_con):
-        temp_file_name = str(tmp_path / "test.csv")
-
+    def test_to_csv_overwrite_not_enabled(self, pandas, temp_file_name, default_con):
         df = pandas.DataFrame(
             {
                 "c_category_1": ["a", "a", "b", "b"],
@@ -308,10 +231,7 @@ class TestToCSV(object):
         with pytest.raises(duckdb.IOException, match="OVERWRITE"):
             rel.to_csv(temp_file_name, header=True, partition_by=["c_category_1"])
 
-    @pytest.mark.parametrize("pandas", [NumpyPandas(), ArrowPandas()])
-    def test_to_csv_per_thread_output(self, pandas, tmp_path, default_con):
-        temp_file_name = str(tmp_path / "test.csv")
-
+    def test_to_csv_per_thread_output(self, pandas, temp_file_name, default_con):
         num_threads = default_con.sql("select current_setting('threads')").fetchone()[0]
         print("num_threads:", num_threads)
         df = pandas.DataFrame(
@@ -328,10 +248,7 @@ class TestToCSV(object):
         csv_rel = default_con.read_csv(f"{temp_file_name}/*.csv", header=True)
         assert rel.execute().fetchall() == csv_rel.execute().fetchall()
 
-    @pytest.mark.parametrize("pandas", [NumpyPandas(), ArrowPandas()])
-    def test_to_csv_use_tmp_file(self, pandas, tmp_path, default_con):
-        temp_file_name = str(tmp_path / "test.csv")
-
+    def test_to_csv_use_tmp_file(self, pandas, temp_file_name, tmp_path, default_con):
         df = pandas.DataFrame(
             {
                 "c_category_1": ["a", "a", "b", "b"],
@@ -344,6 +261,8 @@ class TestToCSV(object):
         )
         rel = default_con.from_df(df)
         rel.to_csv(temp_file_name, header=True)  # csv to be overwritten
+        first_digest = hashlib.sha256((tmp_path / "test.csv").read_bytes()).digest()
         rel.to_csv(temp_file_name, header=True, use_tmp_file=True)
-        csv_rel = default_con.read_csv(temp_file_name, header=True)
-        assert rel.execute().fetchall() == csv_rel.execute().fetchall()
+        # the tmp-file write must produce byte-identical output; the read-back
+        # round-trip itself is already covered by test_basic_to_csv
+        assert hashlib.sha256((tmp_path / "test.csv").read_bytes()).digest() == first_digest
@@ -12,13 +12,17 @@ def f(cur, i, data):
 
 def test_6584():
     pool = ThreadPoolExecutor(max_workers=2)
-    data = pyarrow.Table.from_pydict({"a": [1, 2, 3]})
-    c = duckdb.connect()
-    futures = []
-    for i in range(2):
-        fut = pool.submit(f, c.cursor(), i, data)
-        futures.append(fut)
+    try:
+        data = pyarrow.Table.from_pydict({"a": [1, 2, 3]})
+        c = duckdb.connect()
+        futures = []
+        for i in range(2):
+            fut = pool.submit(f, c.cursor(), i, data)
+            futures.append(fut)
 
-    for fut in futures:
-        arrow_res = fut.result()
-        assert data.equals(arrow_res)
+        for fut in futures:
+            arrow_res = fut.result()
+            assert data.equals(arrow_res)
+    finally:
+        # tear the workers down even on failure so cursors don't outlive the test
+        pool.shutdown(wait=True, cancel_futures=True)
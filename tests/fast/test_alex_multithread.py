@@ -4,11 +4,14 @@ from threading import Thread, current_thread
 import pytest
 
 
-pytestmark = pytest.mark.xfail(
-    condition=platform.system() == "Emscripten",
-    reason="Emscripten builds cannot use threads",
-    raises=RuntimeError,
-)
+pytestmark = [
+    pytest.mark.xfail(
+        condition=platform.system() == "Emscripten",
+        reason="Emscripten builds cannot use threads",
+        raises=RuntimeError,
+    ),
+    pytest.mark.xdist_group("threading"),
+]
 
 
 @pytest.fixture(scope="session")
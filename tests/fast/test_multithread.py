@@ -9,10 +9,15 @@ import os
 from typing import List
 
 
-pytestmark = pytest.mark.xfail(
-    condition=platform.system() == "Emscripten",
-    reason="Emscripten builds cannot use threads",
-)
+pytestmark = [
+    pytest.mark.xfail(
+        condition=platform.system() == "Emscripten",
+        reason="Emscripten builds cannot use threads",
+    ),
+    # keep in-test thread fan-out off shared xdist workers; with
+    # `-n auto --dist loadgroup` these modules get a worker to themselves
+    pytest.mark.xdist_group("threading"),
+]
 
 
 def connect_duck(duckdb_conn):
@@ -0,0 +1,6 @@
+import sys
+from os.path import abspath, dirname, join
+
+# Make the fast-suite modules importable so slow variants can reuse their
+# implementations without per-test sys.path mutation.
+sys.path.insert(0, abspath(join(dirname(__file__), "..", "fast")))
@@ -1,6 +1,10 @@
 import platform
 import pytest
 
+# import the module rather than the class: binding a Test*-named class here
+# would make pytest collect the whole fast TestRelation suite a second time
+import test_relation
+
 
 class TestRelationSlow(object):
     @pytest.mark.skipif(
@@ -9,12 +13,6 @@ class TestRelationSlow(object):
     )
     def test_materialized_relation_large(self, duckdb_cursor):
         """Test materialized relation with 10M rows - moved from fast tests due to 1+ minute runtime"""
-        # Import the implementation function from the fast test
-        import sys
-        import os
-        sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'fast'))
-        from test_relation import TestRelation
-
         # Create instance and call the test with large parameter
-        test_instance = TestRelation()
-        test_instance.test_materialized_relation(duckdb_cursor, 10000000)
\ No newline at end of file
+        test_instance = test_relation.TestRelation()
+        test_instance.test_materialized_relation(duckdb_cursor, 10000000)